@@ -1,22 +1,117 @@
+import hashlib
 import os
+import tempfile
+import threading
+from collections import OrderedDict
 from anthropic import Anthropic
-from app.agents.prompts import generate_agent_prompt, parse_agent_decision, DecisionContext
-from typing import Dict
+from app.agents.prompts import SYSTEM_PROMPT, generate_decision_context, parse_agent_decision, DecisionContext
+from typing import Dict, Optional
 import asyncio
 
+# Shared client: reuses one connection pool (and its keep-alive TLS sockets)
+# across calls. Created on first use so importing this module never needs a key.
+_client: Optional[Anthropic] = None
+
+def _get_client() -> Anthropic:
+    """Return the shared Claude client, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
+    return _client
+
+# Raw replies keyed by a digest of everything sent (model, system prompt and
+# rendered context), so a prompt change never serves a stale reply. Set
+# CLAUDE_DECISION_CACHE_DIR to also persist replies across runs (e.g. in CI).
+DECISION_CACHE_SIZE = 128
+_decision_cache: "OrderedDict[str, str]" = OrderedDict()
+_decision_cache_lock = threading.Lock()
+
+def clear_decision_cache() -> None:
+    """Drop all in-memory cached replies."""
+    with _decision_cache_lock:
+        _decision_cache.clear()
+
+def _decision_key(model: str, prompt: str) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    for part in (model, SYSTEM_PROMPT, prompt):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+def _cache_path(key: str) -> Optional[str]:
+    cache_dir = os.environ.get("CLAUDE_DECISION_CACHE_DIR")
+    return os.path.join(cache_dir, f"{key}.txt") if cache_dir else None
+
+def _cached_decision(key: str) -> Optional[Dict]:
+    """Parsed decision for a cached reply, or None on a miss.
+
+    In-memory replies already parsed once. A persisted reply that no longer
+    parses (e.g. a corrupt file) is deleted so the caller re-requests it.
+    """
+    with _decision_cache_lock:
+        reply = _decision_cache.get(key)
+        if reply is not None:
+            _decision_cache.move_to_end(key)
+    if reply is not None:
+        return parse_agent_decision(reply)
+    path = _cache_path(key)
+    if path and os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            reply = f.read()
+        try:
+            decision = parse_agent_decision(reply)
+        except ValueError:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        _store_reply(key, reply, persist=False)
+        return decision
+    return None
+
+def _store_reply(key: str, reply: str, persist: bool = True) -> None:
+    with _decision_cache_lock:
+        _decision_cache[key] = reply
+        if len(_decision_cache) > DECISION_CACHE_SIZE:
+            _decision_cache.popitem(last=False)
+    path = _cache_path(key) if persist else None
+    if path:
+        # Write to a temp file and rename it into place, so a concurrent
+        # reader (e.g. another xdist worker) never sees a partial reply
+        cache_dir = os.path.dirname(path)
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(reply)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
 def get_agent_decision(context: DecisionContext, model: str = "claude-sonnet-4-5-20250929") -> Dict:
     """Get agent decision using Claude API."""
 
-    # Generate prompt
-    prompt = generate_agent_prompt(context)
+    # Generate the per-request context; the static instructions go in the system prompt
+    prompt = generate_decision_context(context)
+
+    # Identical requests reuse the earlier reply instead of another round-trip
+    key = _decision_key(model, prompt)
+    decision = _cached_decision(key)
+    if decision is not None:
+        return decision
 
-    # Initialize Claude client
-    client = Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
+    client = _get_client()
 
-    # Call Claude API
+    # Call Claude API. The system prompt is identical on every call, so mark
+    # it as a prompt-cache breakpoint; only the student context varies.
     response = client.messages.create(
         model=model,
         max_tokens=1024,
+        system=[
+            {"type": "text", "text": SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}
+        ],
         messages=[
             {"role": "user", "content": prompt}
         ]
@@ -25,8 +120,9 @@ def get_agent_decision(context: DecisionContext, model: str = "claude-sonnet-4-5
     # Extract text from response
     response_text = response.content[0].text
 
-    # Parse decision
+    # Parse decision; only cache replies that parse, so a bad one is retried
     decision = parse_agent_decision(response_text)
+    _store_reply(key, response_text)
 
     return decision
 
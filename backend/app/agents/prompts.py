@@ -1,5 +1,12 @@
+import json
 from typing import List, Dict
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 SYSTEM_PROMPT = """You are a piano teacher helping students master "Perfect" by Ed Sheeran.
 
@@ -24,6 +31,9 @@ Always explain your reasoning concisely.
 """
 
 class DecisionContext(BaseModel):
+    # Immutable once built: the reply cache keys on its contents
+    model_config = ConfigDict(frozen=True)
+
     student_id: str
     goal_skill_id: str
     current_fluency: int
@@ -32,8 +42,8 @@ class DecisionContext(BaseModel):
     student_tendencies: List[str]
     pattern_detected: str
 
-def generate_agent_prompt(context: DecisionContext) -> str:
-    """Generate complete prompt for agent decision-making."""
+def generate_decision_context(context: DecisionContext) -> str:
+    """Generate the per-request part of the agent prompt (everything after SYSTEM_PROMPT)."""
 
     # Format recent attempts
     attempts_text = "\n".join([
@@ -69,11 +79,14 @@ Respond in JSON format:
 }}
 """
 
-    return SYSTEM_PROMPT + "\n" + dynamic_context
+    return dynamic_context
+
+def generate_agent_prompt(context: DecisionContext) -> str:
+    """Generate complete prompt for agent decision-making."""
+    return SYSTEM_PROMPT + "\n" + generate_decision_context(context)
 
 def parse_agent_decision(response_text: str) -> Dict:
     """Parse agent's JSON response into structured decision."""
-    import json
 
     # Extract JSON from response
     start = response_text.find('{')
@@ -83,7 +96,8 @@ def parse_agent_decision(response_text: str) -> Dict:
         raise ValueError("No JSON found in agent response")
 
     json_text = response_text[start:end]
-    decision = json.loads(json_text)
+    # orjson's parse errors subclass json.JSONDecodeError, so callers see the same exceptions
+    decision = orjson.loads(json_text) if ORJSON_AVAILABLE else json.loads(json_text)
 
     # Validate required fields
     required_fields = ["tier", "reasoning"]
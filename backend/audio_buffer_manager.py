@@ -349,9 +349,9 @@ class AudioBufferManager:
             # Enough data for a full window — take the last window_samples
             window = self._buffer[self._read_pos : self._read_pos + self.window_samples].copy()
         else:
-            # Partial window — pad with zeros
-            segment = self._buffer[self._read_pos : self._read_pos + remaining].copy()
-            window = np.pad(segment, (0, self.window_samples - remaining), mode="constant")
+            # Partial window — copy into a zeroed window (one allocation)
+            window = np.zeros(self.window_samples, dtype=np.float32)
+            window[:remaining] = self._buffer[self._read_pos : self._read_pos + remaining]
         self._read_pos = len(self._buffer)
         return window
 
@@ -10,6 +10,8 @@ from dataclasses import dataclass, field
 from enum import Enum
 from typing import Dict, List, Optional, Set, Tuple
 
+import numpy as np
+
 
 class BeatGroupStatus(Enum):
     WAITING = "waiting"
@@ -44,6 +46,15 @@ class ExpectedGroup:
     detected_confidence: Optional[float] = None
 
 
+@dataclass(frozen=True)
+class ExerciseColumns:
+    """Per-note parallel arrays flattened from an exercise's groups."""
+    notes: np.ndarray           # note names (object dtype)
+    frequencies: np.ndarray     # float64 Hz
+    expected_times: np.ndarray  # float64 seconds from exercise start
+    group_ids: np.ndarray       # int32 index into exercise.groups
+
+
 @dataclass
 class BeatExercise:
     """Beat-based exercise consisting of expected groups of notes."""
@@ -58,16 +69,51 @@ class BeatExercise:
         self.current_group_index = 0
         self.start_time = None
         self.completed = False
+        self._columns: Optional[ExerciseColumns] = None
+
+    def as_soa(self) -> ExerciseColumns:
+        """Return the groups flattened to one row per note, built once and cached.
+
+        Groups with fewer frequencies than notes reuse their first frequency.
+        Anything that edits the groups (notes, frequencies or
+        expected_time_sec) must call invalidate_columns() afterwards.
+        """
+        if self._columns is None:
+            count = sum(len(group.notes) for group in self.groups)
+            notes = np.empty(count, dtype=object)
+            frequencies = np.empty(count, dtype=np.float64)
+            expected_times = np.empty(count, dtype=np.float64)
+            group_ids = np.empty(count, dtype=np.int32)
+            start = 0
+            for group_idx, group in enumerate(self.groups):
+                # Group-level values are filled as one slice per group
+                end = start + len(group.notes)
+                group_freqs = group.frequencies
+                notes[start:end] = group.notes
+                frequencies[start:end] = [
+                    group_freqs[note_idx] if note_idx < len(group_freqs) else group_freqs[0]
+                    for note_idx in range(end - start)
+                ]
+                expected_times[start:end] = group.expected_time_sec
+                group_ids[start:end] = group_idx
+                start = end
+            self._columns = ExerciseColumns(notes, frequencies, expected_times, group_ids)
+        return self._columns
+
+    def invalidate_columns(self) -> None:
+        """Drop the cached as_soa() columns after the groups have been edited."""
+        self._columns = None
 
 
 class BeatAwareScoreFollower:
     """Beat-aware score follower with early/late feedback and adaptive tempo."""
 
-    def __init__(self, exercise: BeatExercise, lookahead_groups: int = 1, frequency_tolerance_hz: float = 15.0, practice_mode: bool = False):
+    def __init__(self, exercise: BeatExercise, lookahead_groups: int = 1, frequency_tolerance_hz: float = 15.0, practice_mode: bool = False, trace: bool = True):
         self.exercise = exercise
         self.lookahead_groups = max(0, lookahead_groups)
         self.frequency_tolerance_hz = frequency_tolerance_hz
         self.practice_mode = practice_mode  # When True, timing checks are disabled
+        self.trace = trace  # When False, skip building/printing the per-detection trace
         self.detection_history: List[Dict] = []
 
         # Adaptive tempo state
@@ -106,6 +152,7 @@ class BeatAwareScoreFollower:
             group.expected_time_sec = self._original_times[i] * inv
             group.timing_tolerance_sec = self._original_tolerances[i] * inv
             group.timing_max_sec = self._original_max_windows[i] * inv
+        self.exercise.invalidate_columns()
 
         # Re-anchor: elapsed to old expected == elapsed to new expected
         if self.exercise.start_time is not None and self.exercise.groups:
@@ -278,35 +325,41 @@ class BeatAwareScoreFollower:
         candidates = self.get_current_expected_groups(timestamp)
 
         # Debug logging
-        current_idx = self.exercise.current_group_index
-        expected_notes = [g.notes for g in candidates[:2]]
-        expected_times = [(g.expected_time_sec, g.timing_max_sec) for g in candidates[:2]]
-        print(f"[FOLLOWER] detected={detected_note} @ {elapsed:.2f}s | current_idx={current_idx} | expected={expected_notes} | windows={expected_times}")
+        trace = self.trace
+        if trace:
+            current_idx = self.exercise.current_group_index
+            expected_notes = [g.notes for g in candidates[:2]]
+            expected_times = [(g.expected_time_sec, g.timing_max_sec) for g in candidates[:2]]
+            print(f"[FOLLOWER] detected={detected_note} @ {elapsed:.2f}s | current_idx={current_idx} | expected={expected_notes} | windows={expected_times}")
 
         selected_group: Optional[ExpectedGroup] = None
         for group in candidates:
             if detected_note not in group.notes:
-                print(f"  [SKIP] group {group.position}: {detected_note} not in {group.notes}")
+                if trace:
+                    print(f"  [SKIP] group {group.position}: {detected_note} not in {group.notes}")
                 continue
             if group.matched_notes.count(detected_note) >= group.notes.count(detected_note):
-                print(f"  [SKIP] group {group.position}: already matched")
+                if trace:
+                    print(f"  [SKIP] group {group.position}: already matched")
                 continue
             # Frequency validation: check proximity to expected frequency
             note_idx = group.notes.index(detected_note)
             expected_freq = group.frequencies[note_idx]
             if detected_frequency > 0 and abs(detected_frequency - expected_freq) > self.frequency_tolerance_hz:
-                print(f"  [SKIP] group {group.position}: freq mismatch {detected_frequency:.1f} vs {expected_freq:.1f}")
+                if trace:
+                    print(f"  [SKIP] group {group.position}: freq mismatch {detected_frequency:.1f} vs {expected_freq:.1f}")
                 continue
             delta = elapsed - group.expected_time_sec
             # In practice_mode, accept any correct note regardless of timing
             if self.practice_mode or abs(delta) <= group.timing_max_sec:
-                if self.practice_mode:
-                    print(f"  [MATCH] group {group.position}: practice_mode (timing disabled)")
-                else:
-                    print(f"  [MATCH] group {group.position}: delta={delta:.3f}s within window {group.timing_max_sec:.3f}s")
+                if trace:
+                    if self.practice_mode:
+                        print(f"  [MATCH] group {group.position}: practice_mode (timing disabled)")
+                    else:
+                        print(f"  [MATCH] group {group.position}: delta={delta:.3f}s within window {group.timing_max_sec:.3f}s")
                 selected_group = group
                 break
-            else:
+            elif trace:
                 print(f"  [SKIP] group {group.position}: delta={delta:.3f}s OUTSIDE window {group.timing_max_sec:.3f}s")
 
         if not selected_group:
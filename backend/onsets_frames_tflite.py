@@ -9,7 +9,10 @@ Model: onsets_frames_wavinput.tflite
 Source: https://storage.googleapis.com/magentadata/models/onsets_frames_transcription/tflite/onsets_frames_wavinput.tflite
 """
 
+import hashlib
+import threading
 import numpy as np
+from collections import OrderedDict
 from typing import List, Tuple, Optional, Set
 from dataclasses import dataclass
 from math import gcd
@@ -38,6 +41,29 @@ class NoteEvent:
     onset_strength: float = 0.0  # raw onset probability at the onset frame
 
 
+@dataclass
+class NoteArray:
+    """Struct-of-arrays view of a note list, for vectorized pitch/timing checks"""
+    pitch: np.ndarray  # int16 MIDI note numbers
+    onset_time: np.ndarray  # float32 seconds
+    offset_time: np.ndarray  # float32 seconds
+    velocity: np.ndarray  # float32 0.0-1.0
+
+    @classmethod
+    def from_events(cls, notes: List[NoteEvent]) -> "NoteArray":
+        """Pack NoteEvent fields into parallel arrays (one pass per field)."""
+        count = len(notes)
+        return cls(
+            pitch=np.fromiter((n.pitch for n in notes), dtype=np.int16, count=count),
+            onset_time=np.fromiter((n.onset_time for n in notes), dtype=np.float32, count=count),
+            offset_time=np.fromiter((n.offset_time for n in notes), dtype=np.float32, count=count),
+            velocity=np.fromiter((n.velocity for n in notes), dtype=np.float32, count=count),
+        )
+
+    def __len__(self) -> int:
+        return len(self.pitch)
+
+
 class OnsetsFramesTFLite:
     """
     Wrapper for Onsets and Frames TFLite model.
@@ -47,15 +73,20 @@ class OnsetsFramesTFLite:
     - Output: Onsets (note attacks) + Frames (sustained notes)
     """
 
-    def __init__(self, model_path: str = "onsets_frames_wavinput.tflite"):
+    def __init__(self, model_path: str = "onsets_frames_wavinput.tflite",
+                 num_threads: Optional[int] = None, prediction_cache_size: int = 0):
         """
         Initialize TFLite interpreter.
 
         Args:
             model_path: Path to .tflite model file
+            num_threads: Interpreter thread count (None = runtime default);
+                pass 1 when several processes each load their own model
+            prediction_cache_size: Number of raw model outputs to memoize
+                (0 = off; live audio rarely repeats a window)
         """
         self.model_path = model_path
-        self.interpreter = Interpreter(model_path=model_path)
+        self.interpreter = Interpreter(model_path=model_path, num_threads=num_threads)
         self.interpreter.allocate_tensors()
 
         # Get input/output tensor details
@@ -72,43 +103,94 @@ class OnsetsFramesTFLite:
         self.input_shape = self.input_details[0]['shape']
         self.sample_rate = 16000  # Model expects 16kHz audio
 
+        # Quantized variants take int8/int16 audio; (scale, zero_point) maps
+        # float samples onto the integer grid. Float models report (0.0, 0).
+        self.input_dtype = np.dtype(self.input_details[0]['dtype'])
+        self.input_quantization = self.input_details[0].get('quantization', (0.0, 0))
+
+        # Raw model outputs keyed on a digest of the preprocessed input. The
+        # weights are fixed, so identical windows (e.g. the same audio
+        # transcribed with and without expected_pitches) share one invoke;
+        # only the decoding differs. Off by default; the lock keeps the LRU
+        # consistent when one model is shared across threads.
+        self.prediction_cache_size = prediction_cache_size
+        self._prediction_cache: "OrderedDict[bytes, Tuple[np.ndarray, ...]]" = OrderedDict()
+        self._prediction_cache_lock = threading.Lock()
+
+    @staticmethod
+    def pcm_to_float(audio: np.ndarray) -> np.ndarray:
+        """Convert integer PCM samples to float32 in [-1, 1] (floats pass through)."""
+        if np.issubdtype(audio.dtype, np.unsignedinteger):
+            # Unsigned PCM (e.g. 8-bit WAV) is offset-binary: midpoint is silence
+            midpoint = np.iinfo(audio.dtype).max // 2 + 1
+            centered = np.subtract(audio, midpoint, dtype=np.float32)
+            centered *= np.float32(1.0 / midpoint)
+            return centered
+        if np.issubdtype(audio.dtype, np.integer):
+            scale = 1.0 / float(np.iinfo(audio.dtype).max + 1)
+            return np.multiply(audio, scale, dtype=np.float32)
+        return audio.astype(np.float32, copy=False)
+
+    def _quantize_input(self, audio: np.ndarray) -> np.ndarray:
+        """Map float32 audio onto an integer input tensor's quantized grid."""
+        scale, zero_point = self.input_quantization
+        info = np.iinfo(self.input_dtype)
+        if scale:
+            audio = audio / scale + zero_point
+        else:
+            audio = audio * info.max
+        return np.clip(np.rint(audio), info.min, info.max).astype(self.input_dtype)
+
+    def _output_tensor(self, i: int) -> np.ndarray:
+        """Fetch output *i*, dequantizing integer outputs back to float."""
+        detail = self.output_details[i]
+        tensor = self.interpreter.get_tensor(detail['index'])
+        if np.issubdtype(tensor.dtype, np.integer):
+            scale, zero_point = detail.get('quantization', (0.0, 0))
+            if scale:
+                return (tensor.astype(np.float32) - zero_point) * scale
+        return tensor
+
     def preprocess_audio(self, audio: np.ndarray, original_sr: int = 44100) -> np.ndarray:
         """
         Preprocess audio for model input.
 
         Args:
-            audio: Audio samples (mono, float32, -1.0 to 1.0)
+            audio: Audio samples (mono, float32 in -1.0 to 1.0, or int16 PCM)
             original_sr: Original sample rate
 
         Returns:
-            Preprocessed audio ready for model
+            Preprocessed audio ready for model (quantized if the model is)
         """
-        # Ensure float32
-        audio = audio.astype(np.float32)
+        # Ensure float32 (integer PCM is scaled to [-1, 1])
+        audio = self.pcm_to_float(audio)
 
         # Resample to 16kHz if needed (anti-aliased)
         if original_sr != self.sample_rate:
             g = gcd(original_sr, self.sample_rate)
             audio = resample_poly(audio, self.sample_rate // g, original_sr // g).astype(np.float32)
 
-        # Normalize to [-1, 1]
-        max_val = np.abs(audio).max()
-        if max_val > 0:
-            audio = audio / max_val
-
-        # Pad or truncate to model input size
         # Input shape is [N] not [batch, N]
         expected_length = self.input_shape[0] if len(self.input_shape) == 1 else self.input_shape[1]
 
-        if len(audio) < expected_length:
-            # Pad with zeros
-            audio = np.pad(audio, (0, expected_length - len(audio)), mode='constant')
-        elif len(audio) > expected_length:
-            # Truncate
-            audio = audio[:expected_length]
-
-        # Model expects shape [N] not [1, N]
+        # Normalize to [-1, 1], writing straight into a zeroed window of the
+        # model input size: padding (or truncation) happens in the same pass,
+        # without a normalized temporary or an np.pad copy.
         audio = audio.reshape(-1)
+        max_val = max(audio.max(), -audio.min())
+        window = np.zeros(expected_length, dtype=np.float32)
+        n = min(len(audio), expected_length)
+        if max_val > 0:
+            np.divide(audio[:n], max_val, out=window[:n])
+        else:
+            window[:n] = audio[:n]
+        audio = window
+
+        if np.issubdtype(self.input_dtype, np.integer):
+            audio = self._quantize_input(audio)
+        elif audio.dtype != self.input_dtype:
+            # Half-precision graphs take float16 input
+            audio = audio.astype(self.input_dtype)
 
         return audio
 
@@ -125,7 +207,91 @@ class OnsetsFramesTFLite:
         """
         # Preprocess audio
         audio_input = self.preprocess_audio(audio, sample_rate)
+        return self._invoke(audio_input)
+
+    def preprocess_batch(self, audios: List[np.ndarray], original_sr: int = 44100) -> np.ndarray:
+        """
+        Preprocess several audio chunks at once.
+
+        Equivalent to calling preprocess_audio on each chunk, but resampling
+        and peak normalization run as single vectorized passes over a
+        zero-padded (batch, samples) array.
+
+        Args:
+            audios: Audio chunks (mono, float32 or int16 PCM), any lengths
+            original_sr: Original sample rate shared by all chunks
+
+        Returns:
+            (batch, expected_length) array of model-ready inputs
+        """
+        expected_length = self.input_shape[0] if len(self.input_shape) == 1 else self.input_shape[1]
+        if not audios:
+            return np.zeros((0, expected_length), dtype=self.input_dtype)
+
+        lengths = np.array([len(a) for a in audios])
+        batch = np.zeros((len(audios), lengths.max()), dtype=np.float32)
+        for row, audio in zip(batch, audios):
+            row[:len(audio)] = self.pcm_to_float(np.asarray(audio).reshape(-1))
+
+        if original_sr != self.sample_rate:
+            g = gcd(original_sr, self.sample_rate)
+            up, down = self.sample_rate // g, original_sr // g
+            batch = resample_poly(batch, up, down, axis=1).astype(np.float32)
+            # resample_poly treats samples past the end as zeros, so each row
+            # matches its unpadded resampling once the filter tail that rings
+            # into the padding is cut at that row's own output length.
+            out_lengths = -(-lengths * up // down)
+            batch[np.arange(batch.shape[1]) >= out_lengths[:, None]] = 0.0
+
+        # Per-row peak normalization to [-1, 1]
+        peaks = np.abs(batch).max(axis=1, keepdims=True)
+        np.divide(batch, peaks, out=batch, where=peaks > 0)
+
+        if batch.shape[1] < expected_length:
+            batch = np.pad(batch, ((0, 0), (0, expected_length - batch.shape[1])), mode='constant')
+        else:
+            batch = batch[:, :expected_length]
+
+        if np.issubdtype(self.input_dtype, np.integer):
+            batch = self._quantize_input(batch)
+        elif batch.dtype != self.input_dtype:
+            batch = batch.astype(self.input_dtype)
+
+        return np.ascontiguousarray(batch)
 
+    def _invoke(self, audio_input: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Run the interpreter on one preprocessed input and fetch its outputs.
+
+        With prediction_cache_size > 0, results are memoized and returned
+        read-only, since a cache hit hands back the same arrays.
+        """
+        key = None
+        if self.prediction_cache_size > 0:
+            key = hashlib.blake2b(np.ascontiguousarray(audio_input).tobytes(), digest_size=16).digest()
+            with self._prediction_cache_lock:
+                cached = self._prediction_cache.get(key)
+                if cached is not None:
+                    self._prediction_cache.move_to_end(key)
+                    return cached
+
+        predictions = self._run_interpreter(audio_input)
+        if key is not None:
+            for array in predictions:
+                array.setflags(write=False)
+            with self._prediction_cache_lock:
+                self._prediction_cache[key] = predictions
+                while len(self._prediction_cache) > self.prediction_cache_size:
+                    self._prediction_cache.popitem(last=False)
+        return predictions
+
+    def clear_prediction_cache(self) -> None:
+        """Drop memoized model outputs (e.g. after swapping the interpreter)."""
+        with self._prediction_cache_lock:
+            self._prediction_cache.clear()
+
+    def _run_interpreter(self, audio_input: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Invoke the TFLite interpreter and return (frames, onsets, offsets, velocities)."""
         # Run inference
         self.interpreter.set_tensor(self.input_details[0]['index'], audio_input)
         self.interpreter.invoke()
@@ -135,10 +301,10 @@ class OnsetsFramesTFLite:
         # Output 1: onset_logits [1, 32, 88]
         # Output 2: offset_logits [1, 32, 88]
         # Output 3: velocity_values [1, 32, 88]
-        frame_logits = self.interpreter.get_tensor(self.output_details[0]['index'])
-        onset_logits = self.interpreter.get_tensor(self.output_details[1]['index'])
-        offset_logits = self.interpreter.get_tensor(self.output_details[2]['index'])
-        velocity_values = self.interpreter.get_tensor(self.output_details[3]['index'])
+        frame_logits = self._output_tensor(0)
+        onset_logits = self._output_tensor(1)
+        offset_logits = self._output_tensor(2)
+        velocity_values = self._output_tensor(3)
 
         # Apply sigmoid to logits to get probabilities
         frames = self.sigmoid(frame_logits)
@@ -716,7 +882,7 @@ class OnsetsFramesTFLite:
         High-level API: transcribe audio to notes.
 
         Args:
-            audio: Audio samples (mono, float32)
+            audio: Audio samples (mono, float32 or int16 PCM)
             sample_rate: Sample rate of input
             onset_threshold: Onset detection sensitivity (0-1)
             frame_threshold: Frame detection sensitivity (0-1)
@@ -731,11 +897,58 @@ class OnsetsFramesTFLite:
             List of detected notes with timing (harmonics filtered)
         """
         # Run inference
-        frames, onsets, offsets, velocities = self.predict(audio, sample_rate)
+        predictions = self.predict(audio, sample_rate)
+        rms = float(np.sqrt(np.mean(self.pcm_to_float(audio).astype(np.float64) ** 2)))
+        return self._notes_from_predictions(
+            predictions, rms, onset_threshold, frame_threshold, mode, expected_pitches,
+        )
 
-        # --- Adaptive threshold adjustment based on signal characteristics ---
-        rms = float(np.sqrt(np.mean(audio.astype(np.float64) ** 2)))
+    def transcribe_batch(
+        self,
+        audios: List[np.ndarray],
+        sample_rate: int = 44100,
+        onset_threshold: float = 0.3,
+        frame_threshold: float = 0.2,
+        mode: str = "single_note",
+        expected_pitches: Optional[Set[int]] = None,
+    ) -> List[List[NoteEvent]]:
+        """
+        Transcribe several independent audio chunks.
+
+        The model graph takes a single fixed-length waveform, so inference
+        still runs once per chunk; preprocessing (resampling, normalization)
+        is shared across the batch via preprocess_batch.
+
+        Args:
+            audios: Audio chunks (mono, float32 or int16 PCM)
+            (remaining arguments as for transcribe, applied to every chunk)
+
+        Returns:
+            One list of detected notes per input chunk, in input order
+        """
+        batch = self.preprocess_batch(audios, sample_rate)
+        results = []
+        for audio, audio_input in zip(audios, batch):
+            predictions = self._invoke(audio_input)
+            rms = float(np.sqrt(np.mean(self.pcm_to_float(audio).astype(np.float64) ** 2)))
+            results.append(self._notes_from_predictions(
+                predictions, rms, onset_threshold, frame_threshold, mode, expected_pitches,
+            ))
+        return results
 
+    def _notes_from_predictions(
+        self,
+        predictions: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+        rms: float,
+        onset_threshold: float,
+        frame_threshold: float,
+        mode: str,
+        expected_pitches: Optional[Set[int]],
+    ) -> List[NoteEvent]:
+        """Turn raw model outputs for one window into filtered note events."""
+        frames, onsets, offsets, velocities = predictions
+
+        # --- Adaptive threshold adjustment based on signal characteristics ---
         # Onset strength distribution: ratio of 90th percentile to median
         onset_data_raw = onsets[0] if len(onsets.shape) == 3 else onsets
         onset_maxes = onset_data_raw.max(axis=1)  # max onset per frame
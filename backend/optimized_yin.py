@@ -12,6 +12,7 @@ Enhanced with:
 
 import math
 import numpy as np
+from typing import List, Optional, Union
 
 
 def verify_octave_with_harmonics(audio: np.ndarray, fundamental: float, sample_rate: int) -> bool:
@@ -117,36 +118,23 @@ def should_correct_octave_up(audio: np.ndarray, detected_freq: float, sample_rat
     return False
 
 
-def detect_piano_note(samples: list, sample_rate: int = 44100, min_frequency: float = 65.0, verify_harmonics: bool = True, auto_correct_octave: bool = True) -> dict:
+def _difference_function(frames: np.ndarray, tau_max: int) -> np.ndarray:
     """
-    Optimized YIN algorithm for piano detection.
+    YIN difference function for each row of *frames* (shape (n_frames, N)).
 
-    Args:
-        samples: Audio samples
-        sample_rate: Sample rate in Hz
-        min_frequency: Minimum frequency to detect (default C2=65Hz)
-        verify_harmonics: Use harmonic analysis to verify octaves (slower but more accurate)
-        auto_correct_octave: Automatically correct octave errors for notes below C3 (130Hz)
-
-    Returns: dict with note, frequency, confidence, rms, or None if no note detected
+    The loop runs over lags only; each lag is evaluated for every frame at once.
     """
-    if not samples or len(samples) < 1024:
-        return None
-
-    audio = np.array(samples, dtype=np.float32)
-    rms = np.sqrt(np.mean(audio ** 2))
-
-    if rms < 0.003:
-        return None
+    buffer_size = frames.shape[1]
+    difference = np.zeros((frames.shape[0], tau_max))
+    for tau in range(tau_max):
+        delta = frames[:, :buffer_size - tau_max] - frames[:, tau:tau + buffer_size - tau_max]
+        difference[:, tau] = np.sum(delta ** 2, axis=1)
+    return difference
 
-    buffer_size = len(audio)
-    tau_max = min(buffer_size // 2, sample_rate // 50)
 
-    # Difference function
-    difference = np.zeros(tau_max)
-    for tau in range(tau_max):
-        delta = audio[:buffer_size - tau_max] - audio[tau:tau + buffer_size - tau_max]
-        difference[tau] = np.sum(delta ** 2)
+def _pick_note(audio: np.ndarray, rms: float, difference: np.ndarray, sample_rate: int, min_frequency: float, verify_harmonics: bool, auto_correct_octave: bool) -> dict:
+    """Turn one frame's difference function into a detection (or None)."""
+    tau_max = len(difference)
 
     # Cumulative mean normalized difference
     cmnd = np.ones(tau_max)
@@ -231,6 +219,64 @@ def detect_piano_note(samples: list, sample_rate: int = 44100, min_frequency: fl
     return None
 
 
+def detect_piano_note(samples: Union[list, np.ndarray], sample_rate: int = 44100, min_frequency: float = 65.0, verify_harmonics: bool = True, auto_correct_octave: bool = True) -> dict:
+    """
+    Optimized YIN algorithm for piano detection.
+
+    Args:
+        samples: Audio samples (list or ndarray; float32 arrays are used without copying)
+        sample_rate: Sample rate in Hz
+        min_frequency: Minimum frequency to detect (default C2=65Hz)
+        verify_harmonics: Use harmonic analysis to verify octaves (slower but more accurate)
+        auto_correct_octave: Automatically correct octave errors for notes below C3 (130Hz)
+
+    Returns: dict with note, frequency, confidence, rms, or None if no note detected
+    """
+    if samples is None or len(samples) < 1024:
+        return None
+
+    # No copy when given a float32 ndarray
+    audio = np.asarray(samples, dtype=np.float32)
+    rms = np.sqrt(np.mean(audio ** 2))
+
+    if rms < 0.003:
+        return None
+
+    tau_max = min(len(audio) // 2, sample_rate // 50)
+    difference = _difference_function(audio[np.newaxis, :], tau_max)[0]
+    return _pick_note(audio, rms, difference, sample_rate, min_frequency, verify_harmonics, auto_correct_octave)
+
+
+def detect_piano_note_batch(frames: np.ndarray, sample_rate: int = 44100, min_frequency: float = 65.0, verify_harmonics: bool = True, auto_correct_octave: bool = True) -> List[Optional[dict]]:
+    """
+    Run detect_piano_note on every row of a 2-D batch of equal-length frames.
+
+    The difference function, the expensive part, is computed for all frames
+    that pass the energy gate in one pass over the lags.
+
+    Args:
+        frames: Audio samples, shape (n_frames, frame_size)
+        sample_rate, min_frequency, verify_harmonics, auto_correct_octave: as for detect_piano_note
+
+    Returns: one detect_piano_note result (dict or None) per row
+    """
+    frames = np.asarray(frames, dtype=np.float32)
+    results: List[Optional[dict]] = [None] * len(frames)
+    if frames.shape[1] < 1024:
+        return results
+
+    rms = np.sqrt(np.mean(frames ** 2, axis=1))
+    active = np.flatnonzero(rms >= 0.003)
+    if len(active) == 0:
+        return results
+
+    tau_max = min(frames.shape[1] // 2, sample_rate // 50)
+    difference = _difference_function(frames[active], tau_max)
+    for row, i in enumerate(active):
+        results[i] = _pick_note(frames[i], rms[i], difference[row], sample_rate, min_frequency, verify_harmonics, auto_correct_octave)
+    return results
+
+
 def frequency_to_note(frequency: float) -> str:
     """Convert frequency to note name."""
     if frequency <= 0:
@@ -16,15 +16,16 @@ def detect_piano_note(samples: list, sample_rate: int = 44100, relaxed: bool = F
     have acceptable CMND values and prefer those.
 
     Args:
-        samples: Audio samples (list of floats)
+        samples: Audio samples (list of floats or float32 array; arrays are
+                 used without copying)
         sample_rate: Sample rate in Hz
         relaxed: If True, use higher CMND threshold (0.55 vs 0.35) for noisy audio.
                  Use this for score-aware detection where false positives are filtered.
     """
-    if not samples or len(samples) < 1024:
+    if samples is None or len(samples) < 1024:
         return None
 
-    audio = np.array(samples, dtype=np.float32)
+    audio = np.asarray(samples, dtype=np.float32)
     rms = np.sqrt(np.mean(audio ** 2))
 
     if rms < 0.003:
@@ -4,6 +4,8 @@ Detects 2-3 simultaneous notes for chord recognition
 """
 
 import numpy as np
+import scipy.fft
+from functools import lru_cache
 from typing import List, Tuple, Optional
 from dataclasses import dataclass
 
@@ -25,6 +27,16 @@ class ChordDetection:
     is_chord: bool  # True if 2+ notes detected
 
 
+@lru_cache(maxsize=16)
+def _spectrum_axes(num_samples: int, sample_rate: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Hann window and rfft bin frequencies for one buffer length (shared, read-only)."""
+    window = np.hanning(num_samples)
+    fft_freqs = np.fft.rfftfreq(num_samples, 1 / sample_rate)
+    window.setflags(write=False)
+    fft_freqs.setflags(write=False)
+    return window, fft_freqs
+
+
 class PolyphonicDetector:
     """
     Detects multiple simultaneous pitches using FFT peak detection.
@@ -129,26 +141,42 @@ class PolyphonicDetector:
         Returns:
             ChordDetection with all detected notes
         """
+        return self.detect_from_fft_batch(np.asarray(audio_buffer)[np.newaxis, :])[0]
+
+    def detect_from_fft_batch(self, frames: np.ndarray) -> List[ChordDetection]:
+        """
+        Detect multiple pitches in each row of a batch of equal-length buffers.
+
+        All rows are windowed and transformed by one rfft call, then peak
+        picked one by one exactly as detect_from_fft does.
+
+        Args:
+            frames: Audio samples, shape (n_frames, frame_size)
+
+        Returns:
+            One ChordDetection per row
+        """
         # Apply windowing to reduce spectral leakage
-        window = np.hanning(len(audio_buffer))
-        windowed_buffer = audio_buffer * window
+        window, fft_freqs = _spectrum_axes(frames.shape[1], self.sample_rate)
+
+        # Compute FFT of every row at once
+        fft_magnitudes = np.abs(scipy.fft.rfft(frames * window, axis=1, workers=-1))
 
-        # Compute FFT
-        fft = np.fft.rfft(windowed_buffer)
-        fft_magnitudes = np.abs(fft)
-        fft_freqs = np.fft.rfftfreq(len(windowed_buffer), 1 / self.sample_rate)
+        return [self._detection_from_spectrum(row, fft_freqs) for row in fft_magnitudes]
 
+    def _detection_from_spectrum(self, fft_magnitudes: np.ndarray, fft_freqs: np.ndarray) -> ChordDetection:
+        """Pick peaks from one magnitude spectrum and convert them to notes."""
         # Find peaks
         peaks = self.detect_peaks(fft_magnitudes, fft_freqs)
 
         # Convert peaks to notes
         detected_notes = []
+        max_magnitude = fft_magnitudes.max()
         for freq, magnitude in peaks:
             note_name, octave = self.frequency_to_note(freq)
             full_note = f"{note_name}{octave}"
 
             # Estimate confidence based on magnitude
-            max_magnitude = fft_magnitudes.max()
             confidence = min(magnitude / max_magnitude, 1.0)
 
             detected_notes.append(DetectedNote(
@@ -16,7 +16,21 @@ detector = HybridPianoDetector(sample_rate=16000)
 # Generate test audio at 16kHz (model's native rate)
 sr = 16000
 duration = 1.12  # Model's input length
-t = np.linspace(0, duration, int(sr * duration))
+
+# Single-cycle sine table, sampled by a 32-bit phase accumulator whose top
+# 12 bits index the table: one integer multiply + mask per sample instead
+# of a libm sin call.
+_SIN_TABLE_BITS = 12
+_SIN_TABLE = np.sin(2 * np.pi * np.arange(1 << _SIN_TABLE_BITS) / (1 << _SIN_TABLE_BITS)).astype(np.float32)
+
+
+def sine(freq: float, dur: float, sr: int, amp: float) -> np.ndarray:
+    """Table-lookup sine at *freq* Hz for *dur* seconds, as float32."""
+    n = int(sr * dur)
+    step = int(round(freq / sr * (1 << 32)))
+    phase = (np.arange(n, dtype=np.int64) * step) >> (32 - _SIN_TABLE_BITS)
+    return np.float32(amp) * _SIN_TABLE[phase & ((1 << _SIN_TABLE_BITS) - 1)]
+
 
 # ============================================================================
 # TEST 1: Single C4 Note
@@ -25,8 +39,7 @@ t = np.linspace(0, duration, int(sr * duration))
 print("\n\nTEST 1: Single C4 Note (261.6 Hz)")
 print("-" * 80)
 
-audio1 = 0.5 * np.sin(2 * np.pi * 261.6 * t)
-audio1 = audio1.astype(np.float32)
+audio1 = sine(261.6, duration, sr, 0.5)
 
 print("\n📊 Tier 1 (YIN v3 - Monophonic):")
 result1_t1 = detector.detect(audio1, mode=DetectionMode.MONOPHONIC)
@@ -52,10 +65,9 @@ print("\n\n" + "=" * 80)
 print("TEST 2: C Major Chord (C4 + E4 + G4)")
 print("-" * 80)
 
-audio2 = 0.3 * np.sin(2 * np.pi * 261.6 * t)  # C4
-audio2 += 0.3 * np.sin(2 * np.pi * 329.6 * t)  # E4
-audio2 += 0.3 * np.sin(2 * np.pi * 392.0 * t)  # G4
-audio2 = audio2.astype(np.float32)
+audio2 = sine(261.6, duration, sr, 0.3)  # C4
+audio2 += sine(329.6, duration, sr, 0.3)  # E4
+audio2 += sine(392.0, duration, sr, 0.3)  # G4
 
 print("\n📊 Tier 2 (Chord Verification):")
 result2_t2 = detector.detect(audio2, expected_notes=['C4', 'E4', 'G4'])
@@ -81,10 +93,9 @@ print("\n\n" + "=" * 80)
 print("TEST 3: D Minor Chord (D4 + F4 + A4)")
 print("-" * 80)
 
-audio3 = 0.3 * np.sin(2 * np.pi * 293.7 * t)  # D4
-audio3 += 0.3 * np.sin(2 * np.pi * 349.2 * t)  # F4
-audio3 += 0.3 * np.sin(2 * np.pi * 440.0 * t)  # A4
-audio3 = audio3.astype(np.float32)
+audio3 = sine(293.7, duration, sr, 0.3)  # D4
+audio3 += sine(349.2, duration, sr, 0.3)  # F4
+audio3 += sine(440.0, duration, sr, 0.3)  # A4
 
 print("\n📊 Tier 2 (Verify correct chord):")
 result3_correct = detector.detect(audio3, expected_notes=['D4', 'F4', 'A4'])
@@ -114,8 +125,7 @@ print("\n\n" + "=" * 80)
 print("TEST 4: Single A4 (440 Hz - Concert Pitch)")
 print("-" * 80)
 
-audio4 = 0.6 * np.sin(2 * np.pi * 440.0 * t)
-audio4 = audio4.astype(np.float32)
+audio4 = sine(440.0, duration, sr, 0.6)
 
 print("\n📊 Tier 1 (YIN v3):")
 result4_t1 = detector.detect(audio4, mode=DetectionMode.MONOPHONIC)
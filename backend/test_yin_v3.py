@@ -12,13 +12,14 @@ print("🧪 Testing YIN v3 with octave disambiguation on YouTube audio\n")
 with wave.open('youtube_piano.wav', 'rb') as wav:
     sample_rate = wav.getframerate()
     audio_data = wav.readframes(wav.getnframes())
-    audio = np.frombuffer(audio_data, dtype=np.int16) / 32768.0
+    audio = np.frombuffer(audio_data, dtype=np.int16).astype(np.float32)
+    audio *= 1.0 / 32768.0
 
 print(f"📁 Audio: {len(audio)/sample_rate:.2f}s")
 
 chunk_size = 4096
 hop_size = 2048
-detected_notes = []
+merged_notes = []
 
 current_note = None
 note_start_time = 0
@@ -27,13 +28,37 @@ note_confidence = 0.0
 consecutive_frames = 0
 min_consecutive_frames = 3
 
+
+def emit_note(note, frequency, start_time, duration_ms, confidence):
+    """Append a finished note, merging it into the previous one if it is the
+    same note after a gap of under 0.3s. Notes under 100ms are dropped."""
+    if duration_ms < 100:
+        return
+
+    if merged_notes:
+        prev = merged_notes[-1]
+        time_gap = start_time - (prev['startTime'] + prev['duration'] / 1000)
+
+        if prev['note'] == note and time_gap < 0.3:
+            prev['duration'] = (start_time - prev['startTime']) * 1000 + duration_ms
+            return
+
+    merged_notes.append({
+        "note": note,
+        "frequency": frequency,
+        "startTime": start_time,
+        "duration": duration_ms,
+        "confidence": confidence
+    })
+
+
 print(f"\n🔍 Analyzing with YIN v3 (octave disambiguation enabled)...\n")
 
 for i in range(0, len(audio) - chunk_size, hop_size):
     chunk = audio[i:i + chunk_size]
     current_time = i / sample_rate
     
-    detection = detect_piano_note(chunk.tolist(), sample_rate)
+    detection = detect_piano_note(chunk, sample_rate)
     
     if detection:
         note = detection['note']
@@ -46,14 +71,8 @@ for i in range(0, len(audio) - chunk_size, hop_size):
             # Save previous note
             if current_note and consecutive_frames >= min_consecutive_frames:
                 duration_ms = (current_time - note_start_time) * 1000
-                if duration_ms > 50:
-                    detected_notes.append({
-                        "note": current_note,
-                        "frequency": note_frequency,
-                        "startTime": note_start_time,
-                        "duration": duration_ms,
-                        "confidence": note_confidence
-                    })
+                emit_note(current_note, note_frequency, note_start_time,
+                          duration_ms, note_confidence)
             
             # Start new note
             current_note = note
@@ -65,30 +84,8 @@ for i in range(0, len(audio) - chunk_size, hop_size):
 # Add final note
 if current_note and consecutive_frames >= min_consecutive_frames:
     duration_ms = (len(audio) / sample_rate - note_start_time) * 1000
-    if duration_ms > 50:
-        detected_notes.append({
-            "note": current_note,
-            "frequency": note_frequency,
-            "startTime": note_start_time,
-            "duration": duration_ms,
-            "confidence": note_confidence
-        })
-
-# Merge consecutive same notes
-merged_notes = []
-for note_data in detected_notes:
-    if note_data['duration'] < 100:
-        continue
-    
-    if merged_notes:
-        prev = merged_notes[-1]
-        time_gap = note_data['startTime'] - (prev['startTime'] + prev['duration'] / 1000)
-        
-        if prev['note'] == note_data['note'] and time_gap < 0.3:
-            prev['duration'] = (note_data['startTime'] - prev['startTime']) * 1000 + note_data['duration']
-            continue
-    
-    merged_notes.append(note_data)
+    emit_note(current_note, note_frequency, note_start_time,
+              duration_ms, note_confidence)
 
 print(f"✅ Detection complete: {len(merged_notes)} notes\n")
 
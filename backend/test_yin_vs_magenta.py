@@ -6,14 +6,28 @@ Compares YIN pitch detection (from frontend) with Magenta transcription
 to validate detection accuracy on real-world audio.
 """
 
+import io
 import sys
 import json
 import os
+from bisect import bisect_left, bisect_right
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.fft import irfft, next_fast_len, rfft
 from scipy.io import wavfile
-from collections import Counter
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from contextlib import redirect_stdout
 from dataclasses import dataclass
-from typing import List, Tuple, Set
+from typing import List, Optional, Tuple, Set
+
+# Optional: caps BLAS/OpenMP pools that are already loaded in a worker
+try:
+    from threadpoolctl import threadpool_limits
+    THREADPOOLCTL_AVAILABLE = True
+except ImportError:
+    THREADPOOLCTL_AVAILABLE = False
 
 # Add backend to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -24,82 +38,148 @@ from onsets_frames_tflite import OnsetsFramesTFLite
 # YIN PITCH DETECTION (SIMPLIFIED PORT FROM TYPESCRIPT)
 # ============================================================================
 
-def yin_pitch_detection(samples: np.ndarray, sample_rate: int = 44100) -> List[dict]:
+@dataclass(slots=True)
+class Detection:
+    """A single YIN pitch detection."""
+    time_ms: int
+    note: str
+    midi: int
+    frequency: float
+    confidence: float
+
+
+NOTE_NAMES = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
+MIDI_TO_NOTE = [f"{NOTE_NAMES[m % 12]}{(m // 12) - 1}" for m in range(128)]
+LOG2_440 = np.log2(440.0)
+
+# Frames per batched FFT: keeps the (frames, fft_size) spectra to a few MB
+YIN_BATCH_FRAMES = 256
+
+
+def _yin_cmnd(frames: np.ndarray, tau_max: int, fft_workers: int = -1) -> np.ndarray:
+    """
+    Cumulative mean normalized difference d'(tau) for every row of *frames*.
+
+    Args:
+        frames: (n_frames, window) float32 array
+        tau_max: Number of lags to compute (0 .. tau_max-1)
+        fft_workers: scipy.fft thread count (-1 = all cores; use 1 inside a
+            process pool)
+
+    Returns:
+        (n_frames, tau_max) float32 array of d' values
+    """
+    window_size = frames.shape[1]
+    taus = np.arange(1, tau_max, dtype=np.float32)
+    lags = np.arange(1, tau_max)
+    # Zero-padded FFT size >= 2W-1, so the circular autocorrelation is linear;
+    # next_fast_len picks a 5-smooth size (6144 for W=3072, vs 8192)
+    fft_size = next_fast_len(2 * window_size - 1, real=True)
+
+    # Difference function d(tau) = sum_i (x[i] - x[i+tau])^2, expanded as
+    # sum_{i<W-tau} x[i]^2 + sum_{i>=tau} x[i]^2 - 2 r(tau): the energy
+    # terms come from one cumulative sum, r(tau) from one FFT per row.
+    energy = np.cumsum(frames ** 2, axis=1)
+    spectrum = rfft(frames, fft_size, axis=1, workers=fft_workers)
+    r = irfft(spectrum * np.conj(spectrum), fft_size, axis=1, workers=fft_workers)[:, :tau_max]
+    d = (energy[:, window_size - 1 - lags]
+         + (energy[:, -1:] - energy[:, lags - 1])
+         - 2 * r[:, 1:])
+
+    # Cumulative mean normalized difference (1.0 where the running sum is 0)
+    running_sum = np.cumsum(d, axis=1)
+    positive = running_sum > 0
+    d_prime = np.ones((len(frames), tau_max), dtype=np.float32)
+    d_prime[:, 1:] = np.where(positive, d * taus / np.where(positive, running_sum, 1), 1)
+    return d_prime
+
+
+def _yin_pick(d_prime: np.ndarray, tau_min: int, tau_max: int,
+              threshold: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Threshold search and parabolic refinement on every row of *d_prime*.
+
+    Returns (valid, refined_tau, d_prime_at_tau); rows where no lag in
+    [tau_min, tau_max - 1) dips below *threshold* are False in *valid*.
+    """
+    # First lag below threshold per row: argmax stops at the first True.
+    # tau_min >= 1 and tau <= tau_max - 2, so both parabola neighbours exist.
+    below = d_prime[:, tau_min:tau_max - 1] < threshold
+    valid = below.any(axis=1)
+    rows = np.arange(len(d_prime))
+    tau = below.argmax(axis=1) + tau_min
+
+    # Parabolic interpolation through d'(tau-1), d'(tau), d'(tau+1)
+    s0 = d_prime[rows, tau - 1]
+    s1 = d_prime[rows, tau]
+    s2 = d_prime[rows, tau + 1]
+    curvature = s0 - 2 * s1 + s2
+    flat = np.abs(curvature) <= 1e-9
+    refined = np.where(flat, tau, tau + (s0 - s2) / (2 * np.where(flat, 1.0, curvature)))
+    return valid, refined, s1
+
+
+def yin_pitch_detection(samples: np.ndarray, sample_rate: int = 44100,
+                        fft_workers: int = -1) -> List[Detection]:
     """
     Simplified YIN pitch detection matching the frontend implementation.
+
+    fft_workers is passed to scipy.fft (-1 = all cores).
     """
     WINDOW_SAMPLES = 3072
     HOP_SAMPLES = 512
-    YIN_THRESHOLD = 0.25
+    YIN_THRESHOLD = np.float32(0.25)
     MIN_CONFIDENCE = 0.75
+    MIN_RMS = 0.002
 
     detections = []
 
-    for start in range(0, len(samples) - WINDOW_SAMPLES, HOP_SAMPLES):
-        window = samples[start:start + WINDOW_SAMPLES].astype(np.float64)
-        time_ms = int(start * 1000 / sample_rate)
-
-        # YIN algorithm
-        tau_min = int(sample_rate / 1000)  # ~1000 Hz max
-        tau_max = int(sample_rate / 50)    # ~50 Hz min (for piano range)
-
-        # Difference function
-        d = np.zeros(tau_max)
-        for tau in range(1, tau_max):
-            diff = 0.0
-            for i in range(len(window) - tau):
-                diff += (window[i] - window[i + tau]) ** 2
-            d[tau] = diff
-
-        # Cumulative mean normalized difference
-        d_prime = np.ones(tau_max)
-        d_prime[0] = 1.0
-        running_sum = 0.0
-        for tau in range(1, tau_max):
-            running_sum += d[tau]
-            if running_sum > 0:
-                d_prime[tau] = d[tau] * tau / running_sum
-            else:
-                d_prime[tau] = 1.0
-
-        # Find first minimum below threshold
-        best_tau = 0
-        best_value = 1.0
-        for tau in range(tau_min, tau_max - 1):
-            if d_prime[tau] < YIN_THRESHOLD:
-                # Parabolic interpolation
-                if tau > 0 and tau < len(d_prime) - 1:
-                    s0 = d_prime[tau - 1]
-                    s1 = d_prime[tau]
-                    s2 = d_prime[tau + 1]
-                    refined = tau + (s0 - s2) / (2 * (s0 - 2 * s1 + s2)) if abs(s0 - 2 * s1 + s2) > 1e-9 else tau
-                else:
-                    refined = tau
-                if d_prime[tau] < best_value:
-                    best_tau = refined
-                    best_value = d_prime[tau]
-                break
-
-        if best_tau > 0:
-            frequency = sample_rate / best_tau
-            confidence = 1.0 - best_value
-
-            if confidence >= MIN_CONFIDENCE and 50 <= frequency <= 2000:
-                midi = 69 + 12 * np.log2(frequency / 440.0)
-                midi_rounded = int(round(midi))
-
-                note_names = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
-                octave = (midi_rounded // 12) - 1
-                note = note_names[midi_rounded % 12]
-                note_name = f"{note}{octave}"
-
-                detections.append({
-                    'time_ms': time_ms,
-                    'note': note_name,
-                    'midi': midi_rounded,
-                    'frequency': frequency,
-                    'confidence': confidence
-                })
+    # YIN lag range
+    tau_min = int(sample_rate / 1000)  # ~1000 Hz max
+    tau_max = int(sample_rate / 50)    # ~50 Hz min (for piano range)
+
+    # 16-bit audio needs no more than float32; halves the FFT/cumsum traffic
+    samples = np.asarray(samples, dtype=np.float32)
+
+    # Every analysis window as a strided view (no copy): row k starts at
+    # sample k * HOP_SAMPLES, matching range(0, len - WINDOW, HOP)
+    starts = range(0, len(samples) - WINDOW_SAMPLES, HOP_SAMPLES)
+    if len(starts) == 0:
+        return detections
+    windows = sliding_window_view(samples, WINDOW_SAMPLES)[::HOP_SAMPLES][:len(starts)]
+
+    # Energy gate as in the frontend detector: skip near-silent windows
+    # before any FFT work. Window mean-square comes from one running sum.
+    frame_starts = np.arange(len(starts)) * HOP_SAMPLES
+    power = np.concatenate(([0.0], np.cumsum(np.square(samples, dtype=np.float64))))
+    mean_square = (power[frame_starts + WINDOW_SAMPLES] - power[frame_starts]) / WINDOW_SAMPLES
+    active = np.flatnonzero(mean_square >= MIN_RMS ** 2)
+
+    for batch_start in range(0, len(active), YIN_BATCH_FRAMES):
+        frame_idx = active[batch_start:batch_start + YIN_BATCH_FRAMES]
+        batch = windows[frame_idx]
+        d_primes = _yin_cmnd(batch, tau_max, fft_workers)
+
+        valid, refined, values = _yin_pick(d_primes, tau_min, tau_max, YIN_THRESHOLD)
+
+        # Confidence/range gate and MIDI conversion on the whole batch
+        rows = np.flatnonzero(valid)
+        frequency = sample_rate / refined[rows]
+        confidence = 1.0 - values[rows]
+        keep = (confidence >= MIN_CONFIDENCE) & (frequency >= 50) & (frequency <= 2000)
+        rows, frequency, confidence = rows[keep], frequency[keep], confidence[keep]
+        midi = np.rint(69 + 12 * (np.log2(frequency) - LOG2_440)).astype(int)
+
+        for row, freq, conf, midi_rounded in zip(rows.tolist(), frequency.tolist(),
+                                                 confidence.tolist(), midi.tolist()):
+            start = starts[frame_idx[row]]
+            detections.append(Detection(
+                time_ms=int(start * 1000 / sample_rate),
+                note=MIDI_TO_NOTE[midi_rounded],
+                midi=midi_rounded,
+                frequency=freq,
+                confidence=conf,
+            ))
 
     return detections
 
@@ -108,28 +188,42 @@ def yin_pitch_detection(samples: np.ndarray, sample_rate: int = 44100) -> List[d
 # COMPARISON LOGIC
 # ============================================================================
 
-def compare_detections(magenta_notes: list, yin_detections: list, tolerance_ms: float = 150) -> dict:
+def compare_detections(magenta_notes: list, yin_detections: List[Detection], tolerance_ms: float = 150) -> dict:
     """Compare YIN detections against Magenta ground truth."""
     matched = set()
     matched_yin = set()
     latencies = []
 
+    # Bucket YIN detections by pitch, sorted by time, so each Magenta note
+    # only looks at same-pitch detections inside its tolerance window
+    buckets = defaultdict(list)
+    for j, yin in enumerate(yin_detections):
+        buckets[yin.midi].append((yin.time_ms, j))
+    bucket_times = {}
+    for midi, bucket in buckets.items():
+        bucket.sort()
+        bucket_times[midi] = [t for t, _ in bucket]
+
     for i, mag in enumerate(magenta_notes):
         mag_start_ms = mag['onset_time'] * 1000
         mag_end_ms = mag['offset_time'] * 1000
 
-        for j, yin in enumerate(yin_detections):
-            if j in matched_yin:
-                continue
-
-            if (yin['midi'] == mag['pitch'] and
-                mag_start_ms - tolerance_ms <= yin['time_ms'] <= mag_end_ms + tolerance_ms):
-                matched.add(i)
-                matched_yin.add(j)
-                latency = yin['time_ms'] - mag_start_ms
-                if latency >= 0:
-                    latencies.append(latency)
-                break
+        bucket = buckets.get(mag['pitch'])
+        if not bucket:
+            continue
+        times = bucket_times[mag['pitch']]
+        lo = bisect_left(times, mag_start_ms - tolerance_ms)
+        hi = bisect_right(times, mag_end_ms + tolerance_ms)
+
+        # First unmatched detection in list order, as a linear scan would pick
+        candidates = [j for _, j in bucket[lo:hi] if j not in matched_yin]
+        if candidates:
+            j = min(candidates)
+            matched.add(i)
+            matched_yin.add(j)
+            latency = yin_detections[j].time_ms - mag_start_ms
+            if latency >= 0:
+                latencies.append(latency)
 
     missed = [magenta_notes[i] for i in range(len(magenta_notes)) if i not in matched]
     accuracy = len(matched) / len(magenta_notes) if magenta_notes else 0
@@ -150,8 +244,9 @@ def compare_detections(magenta_notes: list, yin_detections: list, tolerance_ms:
 # MAIN TEST
 # ============================================================================
 
-def test_file(wav_path: str, model: OnsetsFramesTFLite, max_duration_sec: float = 30) -> dict:
-    """Test a single WAV file."""
+def test_file(wav_path: str, model: OnsetsFramesTFLite, max_duration_sec: float = 30,
+              fft_workers: int = -1) -> dict:
+    """Test a single WAV file (fft_workers: YIN FFT threads, -1 = all cores)."""
     print(f"\n{'='*60}")
     print(f"Testing: {os.path.basename(wav_path)}")
     print('='*60)
@@ -161,9 +256,11 @@ def test_file(wav_path: str, model: OnsetsFramesTFLite, max_duration_sec: float
 
     # Normalize to float32 [-1, 1]
     if audio.dtype == np.int16:
-        audio = audio.astype(np.float32) / 32768.0
+        audio = audio.astype(np.float32)
+        audio *= np.float32(1 / 32768)
     elif audio.dtype == np.int32:
-        audio = audio.astype(np.float32) / 2147483648.0
+        audio = audio.astype(np.float32)
+        audio *= np.float32(1 / 2147483648)
 
     # Ensure mono
     if len(audio.shape) > 1:
@@ -201,16 +298,13 @@ def test_file(wav_path: str, model: OnsetsFramesTFLite, max_duration_sec: float
                 'confidence': note.confidence
             })
 
-    # Deduplicate
+    # Deduplicate: in (pitch, onset) order the only kept note that can be
+    # within 100ms of this one is the last kept note of the same pitch
     magenta_notes = []
     for note in sorted(all_notes, key=lambda n: (n['pitch'], n['onset_time'])):
-        is_dup = False
-        for existing in magenta_notes:
-            if (existing['pitch'] == note['pitch'] and
-                abs(existing['onset_time'] - note['onset_time']) < 0.1):
-                is_dup = True
-                break
-        if not is_dup:
+        last = magenta_notes[-1] if magenta_notes else None
+        if (last is None or last['pitch'] != note['pitch'] or
+                note['onset_time'] - last['onset_time'] >= 0.1):
             magenta_notes.append(note)
 
     print(f"   Magenta detected {len(magenta_notes)} notes")
@@ -222,11 +316,11 @@ def test_file(wav_path: str, model: OnsetsFramesTFLite, max_duration_sec: float
 
     # Run YIN detection
     print("\n🎵 Running YIN pitch detection...")
-    yin_detections = yin_pitch_detection(audio_chunk, sr)
+    yin_detections = yin_pitch_detection(audio_chunk, sr, fft_workers)
     print(f"   YIN made {len(yin_detections)} detections")
 
     # Summarize YIN detections
-    yin_note_counts = Counter(d['note'] for d in yin_detections)
+    yin_note_counts = Counter(d.note for d in yin_detections)
     top_yin = yin_note_counts.most_common(8)
     print(f"   Top notes: {', '.join(f'{n}({c})' for n, c in top_yin)}")
 
@@ -248,6 +342,52 @@ def test_file(wav_path: str, model: OnsetsFramesTFLite, max_duration_sec: float
     return result
 
 
+def _init_worker():
+    """Cap BLAS/OpenMP pools already loaded in this worker at one thread."""
+    if THREADPOOLCTL_AVAILABLE:
+        threadpool_limits(1)
+
+
+def _worker_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Process pool whose workers run single-threaded, so files don't oversubscribe cores.
+
+    Thread-count variables are only read when numpy/BLAS load, so they are set
+    here and the workers are spawned (importing numpy fresh) rather than forked
+    with the parent's pools already sized.
+    """
+    for var in ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS'):
+        os.environ.setdefault(var, '1')
+    return ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn'),
+                               initializer=_init_worker)
+
+
+# Model loaded once per worker process, on its first file
+_worker_model = None
+
+
+def _test_file_worker(job: Tuple[str, str, float]) -> Tuple[Optional[dict], str, Optional[str]]:
+    """
+    Run test_file in a worker process.
+
+    Returns (result, captured_output, error); the output is captured so
+    main can print each file's report in order rather than interleaved.
+    """
+    global _worker_model
+    wav_path, model_path, max_duration_sec = job
+
+    log = io.StringIO()
+    with redirect_stdout(log):
+        try:
+            if _worker_model is None:
+                _worker_model = OnsetsFramesTFLite(model_path, num_threads=1)
+            result = test_file(wav_path, _worker_model, max_duration_sec=max_duration_sec,
+                               fft_workers=1)
+            return result, log.getvalue(), None
+        except Exception as e:
+            return None, log.getvalue(), str(e)
+
+
 def main():
     """Run all tests."""
     print("=" * 60)
@@ -262,10 +402,6 @@ def main():
         print(f"❌ Model not found at: {model_path}")
         return
 
-    # Load model
-    print("\n🔧 Loading Magenta TFLite model...")
-    model = OnsetsFramesTFLite(model_path)
-
     # Test files
     test_audio_dir = os.path.join(script_dir, '..', 'frontend', 'test-audio')
     test_files = [
@@ -276,18 +412,30 @@ def main():
         'clair_de_lune_real.wav',
     ]
 
-    results = []
+    jobs = []
     for filename in test_files:
         wav_path = os.path.join(test_audio_dir, filename)
         if os.path.exists(wav_path):
-            try:
-                result = test_file(wav_path, model, max_duration_sec=30)
-                results.append((filename, result))
-            except Exception as e:
-                print(f"\n❌ Error testing {filename}: {e}")
+            jobs.append((filename, wav_path))
         else:
             print(f"\n⚠️  File not found: {filename}")
 
+    # Files are independent: test them in parallel, each worker loading its
+    # own copy of the Magenta TFLite model
+    results = []
+    if jobs:
+        workers = max(1, min(len(jobs), (os.cpu_count() or 2) // 2))
+        print(f"\n🔧 Testing {len(jobs)} files on {workers} worker(s)...")
+        with _worker_pool(workers) as executor:
+            outcomes = executor.map(_test_file_worker,
+                                    [(wav_path, model_path, 30) for _, wav_path in jobs])
+            for (filename, _), (result, log, error) in zip(jobs, outcomes):
+                print(log, end='')
+                if error is not None:
+                    print(f"\n❌ Error testing {filename}: {error}")
+                else:
+                    results.append((filename, result))
+
     # Summary
     print("\n" + "=" * 60)
     print("SUMMARY")
@@ -14,10 +14,12 @@ def load_wav(filename):
     with wave.open(filename, 'rb') as wav:
         sample_rate = wav.getframerate()
         audio_data = wav.readframes(wav.getnframes())
-        audio = np.frombuffer(audio_data, dtype=np.int16) / 32768.0
+        # One pass at float32 (int16 / 2**15 is exact in float32)
+        audio = np.frombuffer(audio_data, dtype=np.int16).astype(np.float32)
+        audio *= 1.0 / 32768.0
         if wav.getnchannels() == 2:
             audio = audio.reshape(-1, 2).mean(axis=1)
-    return audio.astype(np.float32), sample_rate
+    return audio, sample_rate
 
 
 print("\n" + "=" * 80)
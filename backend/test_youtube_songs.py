@@ -10,11 +10,24 @@ Songs tested:
 5. Lag Ja Gale - Piano cover
 """
 
+import io
 import os
+import queue
+import threading
 import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from contextlib import redirect_stdout
 import numpy as np
 import soundfile as sf
 
+# Optional: caps BLAS/OpenMP pools that are already loaded in a worker
+try:
+    from threadpoolctl import threadpool_limits
+    THREADPOOLCTL_AVAILABLE = True
+except ImportError:
+    THREADPOOLCTL_AVAILABLE = False
+
 from onsets_frames_tflite import OnsetsFramesTFLite, NoteEvent
 from audio_buffer_manager import AudioBufferManager
 
@@ -70,8 +83,36 @@ for midi in range(21, 109):
     MIDI_TO_NOTE[midi] = f"{name}{octave}"
 
 
-def transcribe_long_audio(model, audio, sample_rate):
-    """Transcribe long audio using sliding window with consensus merge."""
+def read_blocks_async(filepath, blocksize, frames, maxsize=4):
+    """
+    Yield mono float32 blocks of *filepath* decoded on a background thread.
+
+    Up to *maxsize* blocks are read ahead into a bounded queue, so disk
+    reads and decoding overlap with inference on the consuming thread.
+    Only the first *frames* frames are read.
+    """
+    blocks = queue.Queue(maxsize=maxsize)
+
+    def reader():
+        try:
+            for block in sf.blocks(filepath, blocksize=blocksize, frames=frames,
+                                   dtype='float32', always_2d=False):
+                if block.ndim > 1:
+                    block = block.mean(axis=1, dtype=np.float32)  # mono
+                blocks.put(block)
+        except Exception as e:
+            blocks.put(e)
+        blocks.put(None)
+
+    threading.Thread(target=reader, daemon=True).start()
+    while (block := blocks.get()) is not None:
+        if isinstance(block, Exception):
+            raise block
+        yield block
+
+
+def transcribe_blocks(model, blocks, sample_rate):
+    """Transcribe a stream of audio blocks using sliding window with consensus merge."""
     buf_mgr = AudioBufferManager(
         sample_rate=sample_rate,
         window_samples=int(17920 * sample_rate / 16000),
@@ -79,10 +120,7 @@ def transcribe_long_audio(model, audio, sample_rate):
     )
 
     all_notes = []
-    chunk_size = int(sample_rate * 0.5)  # 500ms chunks
-
-    for i in range(0, len(audio), chunk_size):
-        chunk = audio[i : i + chunk_size]
+    for chunk in blocks:
         window = buf_mgr.add_chunk(chunk)
         if window is not None:
             notes = model.transcribe(window, sample_rate=sample_rate)
@@ -102,6 +140,16 @@ def transcribe_long_audio(model, audio, sample_rate):
     return all_notes
 
 
+def transcribe_long_audio(model, audio, sample_rate):
+    """Transcribe long in-memory audio using sliding window with consensus merge."""
+    chunk_size = int(sample_rate * 0.5)  # 500ms chunks
+    return transcribe_blocks(
+        model,
+        (audio[i : i + chunk_size] for i in range(0, len(audio), chunk_size)),
+        sample_rate,
+    )
+
+
 def analyze_notes(notes):
     """Analyze detected notes and return summary statistics."""
     if not notes:
@@ -183,64 +231,118 @@ def print_timeline(notes, max_time=None, width=80):
             print(f"    {name:>5}: {'|' * min(count, 50)} ({count})")
 
 
+def process_song(model, info):
+    """Transcribe the first 60s of one song and print its report."""
+    filepath = info["file"]
+    print("-" * 70)
+    print(f"  {info['title']}")
+    print(f"  Key: {info['key']} | Source: {info['source']}")
+    print()
+
+    # Stream only the audio we process (first 60s, or full if short) in
+    # 500ms float32 blocks, decoded on a reader thread during inference
+    max_seconds = 60
+    info_sf = sf.info(filepath)
+    sr = info_sf.samplerate
+    total_seconds = info_sf.frames / sr
+    clip_frames = min(info_sf.frames, int(sr * max_seconds))
+
+    if total_seconds > max_seconds:
+        print(f"  Processing first {max_seconds}s of {total_seconds:.0f}s audio (sr={sr})")
+    else:
+        print(f"  Processing full {total_seconds:.0f}s audio (sr={sr})")
+
+    t0 = time.time()
+    chunk_size = int(sr * 0.5)  # 500ms chunks
+    notes = transcribe_blocks(model, read_blocks_async(filepath, chunk_size, clip_frames), sr)
+    elapsed = time.time() - t0
+
+    # Analyze
+    stats = analyze_notes(notes)
+    print(f"  Detected: {stats['count']} notes in {elapsed:.1f}s")
+    if stats['count'] > 0:
+        print(f"  Pitch range: {stats['pitch_range']}")
+        print(f"  Unique pitches: {stats['unique_pitches']}")
+        print(f"  Avg confidence: {stats['avg_confidence']:.3f}")
+        print(f"  Avg velocity: {stats['avg_velocity']:.3f}")
+        print(f"  Avg duration: {stats['avg_duration']:.2f}s")
+
+        # Note distribution (top 10)
+        dist = stats['note_distribution']
+        top = list(dist.items())[:10]
+        print(f"  Top notes: {', '.join(f'{n}({c})' for n, c in top)}")
+
+        # Timeline
+        print_timeline(notes, max_time=min(clip_frames / sr, max_seconds))
+
+    print()
+
+
+def _init_worker():
+    """Cap BLAS/OpenMP pools already loaded in this worker at one thread."""
+    if THREADPOOLCTL_AVAILABLE:
+        threadpool_limits(1)
+
+
+def _worker_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Process pool whose workers run single-threaded, so songs don't oversubscribe cores.
+
+    Thread-count variables are only read when numpy/BLAS load, so they are set
+    here and the workers are spawned (importing numpy fresh) rather than forked
+    with the parent's pools already sized.
+    """
+    for var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ.setdefault(var, "1")
+    return ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn"),
+                               initializer=_init_worker)
+
+
+# Model loaded once per worker process, on its first song
+_worker_model = None
+
+
+def _process_song_worker(info):
+    """
+    Run process_song in a worker process.
+
+    Returns the captured report so main can print songs in order rather
+    than interleaved.
+    """
+    global _worker_model
+    log = io.StringIO()
+    with redirect_stdout(log):
+        try:
+            if _worker_model is None:
+                _worker_model = OnsetsFramesTFLite(num_threads=1)
+            process_song(_worker_model, info)
+        except Exception as e:
+            print(f"  ERROR: {info['title']}: {e}")
+    return log.getvalue()
+
+
 def main():
     print("=" * 70)
     print("  YouTube Piano Detection Test")
     print("=" * 70)
 
-    model = OnsetsFramesTFLite()
-    print(f"  Model loaded: input shape {model.input_shape}")
-    print()
-
+    songs = []
     for song_id, info in SONG_INFO.items():
         filepath = info["file"]
         if not os.path.exists(filepath):
             print(f"  SKIP: {info['title']} (file not found: {filepath})")
             continue
+        songs.append(info)
 
-        print("-" * 70)
-        print(f"  {info['title']}")
-        print(f"  Key: {info['key']} | Source: {info['source']}")
-        print()
-
-        # Load audio
-        audio, sr = sf.read(filepath)
-        if audio.ndim > 1:
-            audio = audio.mean(axis=1)  # mono
-        audio = audio.astype(np.float32)
-
-        # Only process first 60s for speed (or full if short)
-        max_seconds = 60
-        if len(audio) / sr > max_seconds:
-            audio_clip = audio[: int(sr * max_seconds)]
-            print(f"  Processing first {max_seconds}s of {len(audio)/sr:.0f}s audio (sr={sr})")
-        else:
-            audio_clip = audio
-            print(f"  Processing full {len(audio)/sr:.0f}s audio (sr={sr})")
-
-        t0 = time.time()
-        notes = transcribe_long_audio(model, audio_clip, sr)
-        elapsed = time.time() - t0
-
-        # Analyze
-        stats = analyze_notes(notes)
-        print(f"  Detected: {stats['count']} notes in {elapsed:.1f}s")
-        if stats['count'] > 0:
-            print(f"  Pitch range: {stats['pitch_range']}")
-            print(f"  Unique pitches: {stats['unique_pitches']}")
-            print(f"  Avg confidence: {stats['avg_confidence']:.3f}")
-            print(f"  Avg velocity: {stats['avg_velocity']:.3f}")
-            print(f"  Avg duration: {stats['avg_duration']:.2f}s")
-
-            # Note distribution (top 10)
-            dist = stats['note_distribution']
-            top = list(dist.items())[:10]
-            print(f"  Top notes: {', '.join(f'{n}({c})' for n, c in top)}")
-
-            # Timeline
-            print_timeline(notes, max_time=min(len(audio_clip) / sr, max_seconds))
-
+    # Songs are independent: transcribe them in parallel, each worker
+    # loading its own copy of the model
+    if songs:
+        workers = max(1, min(len(songs), (os.cpu_count() or 2) // 2))
+        print(f"  Processing {len(songs)} songs on {workers} worker(s)")
         print()
+        with _worker_pool(workers) as executor:
+            for report in executor.map(_process_song_worker, songs):
+                print(report, end="")
 
     print("=" * 70)
     print("  Done!")
@@ -0,0 +1,97 @@
+"""
+Shared pytest configuration for the backend tests.
+
+Markers:
+    slow     - long-running tests (real MIDI work, real API round-trips)
+    network  - tests that call an external service
+
+The suite is safe to shard with pytest-xdist. Fast lane:
+    pytest -n auto --dist=loadfile -m "not slow"
+Full run:
+    pytest -n auto --dist=loadfile
+
+--dist=loadfile keeps each module on one worker so module-level caches
+(e.g. parsed MIDI exercises) are reused across its tests.
+"""
+
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BACKEND_DIR)
+
+PERFECT_MIDI = os.path.join(
+    BACKEND_DIR, "test_songs", "perfect", "ed-sheeran---perfect-easy-for-beginners.mid",
+)
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "slow: long-running test, deselect with -m 'not slow'")
+    config.addinivalue_line("markers", "network: test calls an external service")
+
+
+@pytest.fixture(scope="session")
+def perfect_exercise():
+    """The "Perfect" MIDI exercise, parsed once per session.
+
+    Shared by every test that requests it, so treat it as read-only
+    (run_test deep-copies it before following).
+    """
+    from midi_exercise import load_midi_exercise
+
+    try:
+        return load_midi_exercise(midi_path=PERFECT_MIDI, name="Perfect - Ed Sheeran (Easy)")
+    except (RuntimeError, OSError, ValueError) as e:
+        # mido missing, file absent, or an un-fetched Git LFS pointer
+        pytest.skip(f"Perfect MIDI unavailable: {e}")
+
+
+class _FakeContent:
+    __slots__ = ("text",)
+
+    def __init__(self, text):
+        self.text = text
+
+
+class _FakeResponse:
+    __slots__ = ("content",)
+
+    def __init__(self, content):
+        self.content = content
+
+
+class _FakeMessages:
+    """Stands in for client.messages: create() records its kwargs and
+    returns a response whose text is the current ``reply``."""
+
+    def __init__(self):
+        self.reply = ""
+        self.calls = []
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        return _FakeResponse([_FakeContent(self.reply)])
+
+
+class _FakeAnthropicClient:
+    def __init__(self):
+        self.messages = _FakeMessages()
+
+
+@pytest.fixture
+def mock_anthropic(monkeypatch):
+    """Swap the shared Claude client for a plain fake.
+
+    Set ``mock_anthropic.messages.reply`` to the model's text; inspect
+    ``mock_anthropic.messages.calls`` for what was sent. The decision
+    cache is cleared around each test so canned replies never leak.
+    """
+    from app.agents import claude_client
+
+    fake = _FakeAnthropicClient()
+    monkeypatch.setattr(claude_client, "_client", fake)
+    claude_client.clear_decision_cache()
+    yield fake
+    claude_client.clear_decision_cache()
@@ -7,42 +7,85 @@ and validates early/late/on-time feedback plus completion.
 """
 
 import argparse
+import copy
+import csv
+import functools
+import io
+import json
 import os
-import random
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from typing import List, Tuple
 
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import numpy as np
+import pytest
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BACKEND_DIR)
 
 from midi_exercise import load_midi_exercise
-from beat_score_follower import BeatAwareScoreFollower
+from beat_score_follower import BeatAwareScoreFollower, BeatExercise, ExpectedGroup
+
+# Same file the conftest perfect_exercise fixture loads
+PERFECT_MIDI = os.path.join(
+    BACKEND_DIR, "test_songs", "perfect", "ed-sheeran---perfect-easy-for-beginners.mid",
+)
+
+
+# Timing status -> tally index, in the order the counts are reported
+TIMING_CODES = {"on_time": 0, "early": 1, "late": 2}
+
 
+@functools.lru_cache(maxsize=8)
+def load_exercise(midi_path: str, name: str) -> BeatExercise:
+    """Load an exercise, parsing each MIDI file only once per process.
 
-def run_test(midi_path: str, name: str, offset_ms: int, jitter_ms: int, seed: int) -> int:
-    exercise = load_midi_exercise(midi_path=midi_path, name=name)
-    follower = BeatAwareScoreFollower(exercise, lookahead_groups=1)
+    The result is shared between runs; run_test works on its own copy.
+    """
+    return load_midi_exercise(midi_path=midi_path, name=name)
+
+
+def run_test(exercise: BeatExercise, midi_path: str, offset_ms: int, jitter_ms: int, seed: int,
+             trace: bool = True) -> int:
+    # Per-note columns come from the caller's (possibly cached) exercise, so
+    # repeated runs flatten it only once
+    columns = exercise.as_soa()
+    # The follower mutates group status and timing, so keep the caller's
+    # exercise untouched
+    exercise = copy.deepcopy(exercise)
+    follower = BeatAwareScoreFollower(exercise, lookahead_groups=1, trace=trace)
     follower.start()
 
-    rng = random.Random(seed)
     total_groups = len(exercise.groups)
-    timing_counts = {"on_time": 0, "early": 0, "late": 0}
-    mismatches = 0
-
-    for group in exercise.groups:
-        for note_idx, note in enumerate(group.notes):
-            jitter = rng.uniform(-jitter_ms, jitter_ms) / 1000.0 if jitter_ms > 0 else 0.0
-            ts = follower.exercise.start_time + group.expected_time_sec + (offset_ms / 1000.0) + jitter
-            freq = group.frequencies[note_idx] if note_idx < len(group.frequencies) else group.frequencies[0]
-            result = follower.process_detection(
-                detected_note=note,
-                detected_frequency=freq,
-                confidence=0.9,
-                timestamp=ts,
-            )
-            if not result.get("matched"):
-                mismatches += 1
-                continue
-            timing_status = result.get("timing_status", "on_time")
-            timing_counts[timing_status] = timing_counts.get(timing_status, 0) + 1
+
+    notes = columns.notes.tolist()
+    freqs = columns.frequencies.tolist()
+    # Build the simulated timeline in integer microseconds, where offset and
+    # jitter add exactly, and convert to wall-clock seconds once at the end
+    elapsed_us = np.rint(columns.expected_times * 1e6).astype(np.int64)
+    elapsed_us += offset_ms * 1000
+    if jitter_ms > 0:
+        half_range_us = jitter_ms * 1000
+        rng = np.random.Generator(np.random.PCG64(seed))
+        elapsed_us += rng.integers(-half_range_us, half_range_us, size=len(notes), endpoint=True)
+    timestamps = follower.exercise.start_time + elapsed_us / 1e6
+
+    # One int8 status code per note (-1 = unmatched), tallied after the loop
+    codes = np.empty(len(notes), dtype=np.int8)
+    for i, (note, freq, ts) in enumerate(zip(notes, freqs, timestamps.tolist())):
+        result = follower.process_detection(
+            detected_note=note,
+            detected_frequency=freq,
+            confidence=0.9,
+            timestamp=ts,
+        )
+        # process_detection always sets "matched", and "timing_status" on a match
+        codes[i] = TIMING_CODES[result["timing_status"]] if result["matched"] else -1
+
+    mismatches = int(np.count_nonzero(codes < 0))
+    counts = np.bincount(codes[codes >= 0], minlength=len(TIMING_CODES)).tolist()
+    timing_counts = dict(zip(TIMING_CODES, counts))
 
     progress = follower.get_progress()
     completed = progress.get("completed", False)
@@ -67,15 +110,106 @@ def run_test(midi_path: str, name: str, offset_ms: int, jitter_ms: int, seed: in
     return 0
 
 
+@pytest.mark.slow
+@pytest.mark.parametrize(
+    "offset_ms,jitter_ms,seed",
+    [(0, 0, 1337), (100, 0, 1337), (-100, 0, 1337), (0, 40, 1337), (60, 40, 7)],
+)
+def test_follower(perfect_exercise, offset_ms, jitter_ms, seed):
+    assert run_test(perfect_exercise, PERFECT_MIDI, offset_ms, jitter_ms, seed, trace=False) == 0
+
+
+def test_as_soa_flattens_groups():
+    groups = [
+        ExpectedGroup(notes=["C4", "E4"], frequencies=[261.63], position=0, beat_position=0.0,
+                      expected_time_sec=0.0, bar_index=0, timing_tolerance_sec=0.1, timing_max_sec=0.3),
+        ExpectedGroup(notes=["G4"], frequencies=[392.0], position=1, beat_position=1.0,
+                      expected_time_sec=0.5, bar_index=0, timing_tolerance_sec=0.1, timing_max_sec=0.3),
+    ]
+    exercise = BeatExercise(name="soa", groups=groups, bpm=120, time_signature=(4, 4),
+                            beat_unit=1.0, beats_per_bar=4.0)
+
+    columns = exercise.as_soa()
+    assert columns.notes.tolist() == ["C4", "E4", "G4"]
+    assert columns.frequencies.tolist() == [261.63, 261.63, 392.0]
+    assert columns.expected_times.tolist() == [0.0, 0.0, 0.5]
+    assert columns.group_ids.tolist() == [0, 0, 1]
+    assert exercise.as_soa() is columns
+
+    # Rescaling the tempo changes expected times, so the columns are rebuilt
+    BeatAwareScoreFollower(exercise).set_tempo_multiplier(0.5)
+    assert exercise.as_soa().expected_times.tolist() == [0.0, 0.0, 1.0]
+
+    # Direct edits to the groups take effect once the columns are invalidated
+    groups[1].expected_time_sec = 2.0
+    exercise.invalidate_columns()
+    assert exercise.as_soa().expected_times.tolist() == [0.0, 0.0, 2.0]
+
+
+def load_sweep(path: str) -> List[Tuple[int, int, int]]:
+    """Read (offset_ms, jitter_ms, seed) triples from a JSON list or a CSV file.
+
+    CSV rows that do not parse as integers (e.g. a header) are skipped.
+    """
+    if path.endswith(".json"):
+        with open(path) as f:
+            return [tuple(int(v) for v in row) for row in json.load(f)]
+
+    configs = []
+    with open(path, newline="") as f:
+        for row in csv.reader(f):
+            try:
+                offset_ms, jitter_ms, seed = (int(v) for v in row)
+            except ValueError:
+                continue
+            configs.append((offset_ms, jitter_ms, seed))
+    return configs
+
+
+def _init_sweep_worker(midi_path: str, name: str) -> None:
+    # Parse the MIDI once per worker, before its first configuration
+    load_exercise(midi_path, name)
+
+
+def _sweep_worker(job: Tuple[str, str, int, int, int]) -> Tuple[int, str]:
+    """Run one sweep configuration; returns (exit code, result summary)."""
+    midi_path, name, offset_ms, jitter_ms, seed = job
+    log = io.StringIO()
+    with redirect_stdout(log):
+        rc = run_test(load_exercise(midi_path, name), midi_path, offset_ms, jitter_ms, seed, trace=False)
+    return rc, log.getvalue()
+
+
+def run_sweep(midi_path: str, name: str, configs: List[Tuple[int, int, int]]) -> int:
+    """Run every (offset_ms, jitter_ms, seed) configuration across worker processes."""
+    workers = max(1, min(len(configs), (os.cpu_count() or 1) - 2))
+    print(f"Sweeping {len(configs)} configurations on {workers} worker(s)")
+
+    jobs = [(midi_path, name, offset_ms, jitter_ms, seed) for offset_ms, jitter_ms, seed in configs]
+    failures = 0
+    worst = 0
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_sweep_worker,
+        initargs=(midi_path, name),
+    ) as executor:
+        for (offset_ms, jitter_ms, seed), (rc, summary) in zip(configs, executor.map(_sweep_worker, jobs)):
+            print(summary, end="")
+            print(f"--> offset={offset_ms}ms jitter={jitter_ms}ms seed={seed}: {'PASS' if rc == 0 else f'FAIL ({rc})'}")
+            print()
+            if rc != 0:
+                failures += 1
+                worst = max(worst, rc)
+
+    print(f"Sweep: {len(configs) - failures}/{len(configs)} configurations passed")
+    return worst
+
+
 def main() -> int:
     parser = argparse.ArgumentParser()
-    _default_midi = os.path.join(
-        os.path.dirname(__file__), "..",
-        "test_songs", "perfect", "ed-sheeran---perfect-easy-for-beginners.mid",
-    )
     parser.add_argument(
         "--midi",
-        default=_default_midi,
+        default=PERFECT_MIDI,
         help="Path to MIDI file",
     )
     parser.add_argument(
@@ -101,13 +235,21 @@ def main() -> int:
         default=1337,
         help="Random seed for jitter",
     )
+    parser.add_argument(
+        "--sweep",
+        help="JSON or CSV file of (offset_ms, jitter_ms, seed) triples to run in parallel",
+    )
     args = parser.parse_args()
 
     if not os.path.exists(args.midi):
         print(f"FAIL: MIDI not found at {args.midi}")
         return 1
 
-    return run_test(args.midi, args.name, args.offset_ms, args.jitter_ms, args.seed)
+    if args.sweep:
+        return run_sweep(args.midi, args.name, load_sweep(args.sweep))
+
+    exercise = load_exercise(args.midi, args.name)
+    return run_test(exercise, args.midi, args.offset_ms, args.jitter_ms, args.seed)
 
 
 if __name__ == "__main__":
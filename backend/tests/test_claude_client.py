@@ -1,44 +1,112 @@
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from pydantic import ValidationError
+from app.agents import claude_client
 from app.agents.claude_client import get_agent_decision
 from app.agents.prompts import DecisionContext
 
-def test_get_agent_decision():
-    # Mock the Anthropic class and its response
-    with patch('app.agents.claude_client.Anthropic') as mock_anthropic_class:
-        # Create mock client instance
-        mock_client = MagicMock()
-
-        # Create mock response
-        mock_response = MagicMock()
-        mock_content = MagicMock()
-        mock_content.text = '{"tier": 3, "reasoning": "Consistent rushing", "feedback_message": "Try slowing down", "drill_id": "isolate_beat_4"}'
-        mock_response.content = [mock_content]
-
-        # Configure mock to return our response
-        mock_client.messages.create.return_value = mock_response
-        mock_anthropic_class.return_value = mock_client
-
-        # Create test context
-        context = DecisionContext(
-            student_id="sarah_123",
-            goal_skill_id="L3.2",
-            current_fluency=40,
-            attempt_count=3,
-            recent_attempts=[{"timing": [+100], "pitch": [100]}],
-            student_tendencies=["rushes_beat_4"],
-            pattern_detected="rushing beat 4"
-        )
-
-        # Call the function
-        decision = get_agent_decision(context)
-
-        # Verify results
-        assert decision["tier"] == 3
-        assert decision["drill_id"] == "isolate_beat_4"
-        assert decision["reasoning"] == "Consistent rushing"
-        assert decision["feedback_message"] == "Try slowing down"
-
-        # Verify the API was called
-        assert mock_client.messages.create.called
-        assert mock_anthropic_class.called
+# Canned model replies, shared across parametrized cases
+_DECISION_JSON = '{"tier": 3, "reasoning": "Consistent rushing", "feedback_message": "Try slowing down", "drill_id": "isolate_beat_4"}'
+_DECISION_JSON_T1 = '{"tier": 1, "reasoning": "Timing within thresholds"}'
+
+
+def _context(**updates) -> DecisionContext:
+    context = DecisionContext(
+        student_id="sarah_123",
+        goal_skill_id="L3.2",
+        current_fluency=40,
+        attempt_count=3,
+        recent_attempts=[{"timing": [+100], "pitch": [100]}],
+        student_tendencies=["rushes_beat_4"],
+        pattern_detected="rushing beat 4"
+    )
+    return context.model_copy(update=updates) if updates else context
+
+
+@pytest.mark.parametrize("payload,expected", [
+    (_DECISION_JSON, {
+        "tier": 3,
+        "reasoning": "Consistent rushing",
+        "feedback_message": "Try slowing down",
+        "drill_id": "isolate_beat_4",
+    }),
+    (_DECISION_JSON_T1, {
+        "tier": 1,
+        "reasoning": "Timing within thresholds",
+    }),
+])
+def test_get_agent_decision(mock_anthropic, payload, expected):
+    mock_anthropic.messages.reply = payload
+
+    # Call the function
+    decision = get_agent_decision(_context())
+
+    # Verify results
+    assert decision == expected
+
+    # Verify the API was called
+    assert mock_anthropic.messages.calls
+
+    # Static instructions go in a cacheable system block, not the user turn
+    call = mock_anthropic.messages.calls[0]
+    assert call["system"][0]["cache_control"] == {"type": "ephemeral"}
+    assert "sarah_123" in call["messages"][0]["content"]
+    assert call["system"][0]["text"] not in call["messages"][0]["content"]
+
+
+def test_get_agent_decision_reuses_cached_reply(mock_anthropic, tmp_path, monkeypatch):
+    monkeypatch.setenv("CLAUDE_DECISION_CACHE_DIR", str(tmp_path))
+    mock_anthropic.messages.reply = _DECISION_JSON
+    calls = mock_anthropic.messages.calls
+
+    first = get_agent_decision(_context())
+    second = get_agent_decision(_context())
+    assert len(calls) == 1
+    assert first == second
+    assert first is not second
+
+    # Persisted replies survive an in-memory reset
+    claude_client.clear_decision_cache()
+    assert get_agent_decision(_context()) == first
+    assert len(calls) == 1
+
+    # A different context is a different request
+    get_agent_decision(_context(attempt_count=4))
+    assert len(calls) == 2
+
+
+def test_get_agent_decision_does_not_cache_bad_reply(mock_anthropic, tmp_path, monkeypatch):
+    monkeypatch.setenv("CLAUDE_DECISION_CACHE_DIR", str(tmp_path))
+    mock_anthropic.messages.reply = "sorry, I can't"
+    calls = mock_anthropic.messages.calls
+
+    with pytest.raises(ValueError):
+        get_agent_decision(_context())
+    assert not list(tmp_path.iterdir())
+
+    # A retry with the same context asks again and gets the good reply
+    mock_anthropic.messages.reply = _DECISION_JSON
+    assert get_agent_decision(_context())["tier"] == 3
+    assert len(calls) == 2
+
+
+def test_get_agent_decision_refetches_corrupt_disk_reply(mock_anthropic, tmp_path, monkeypatch):
+    monkeypatch.setenv("CLAUDE_DECISION_CACHE_DIR", str(tmp_path))
+    mock_anthropic.messages.reply = _DECISION_JSON
+    calls = mock_anthropic.messages.calls
+
+    expected = get_agent_decision(_context())
+    (cached,) = tmp_path.iterdir()
+    cached.write_text('{"tier": 3, "reas', encoding="utf-8")
+
+    # A truncated entry is dropped and re-requested, not served forever
+    claude_client.clear_decision_cache()
+    assert get_agent_decision(_context()) == expected
+    assert len(calls) == 2
+    assert [p.name for p in tmp_path.iterdir()] == [cached.name]
+    assert cached.read_text(encoding="utf-8") == _DECISION_JSON
+
+
+def test_decision_context_is_frozen():
+    context = _context()
+    with pytest.raises(ValidationError):
+        context.attempt_count = 4
@@ -7,6 +7,8 @@ import pytest
 from app.agents.claude_client import get_agent_decision
 from app.agents.prompts import DecisionContext
 
+@pytest.mark.slow
+@pytest.mark.network
 @pytest.mark.skipif(not os.environ.get("ANTHROPIC_API_KEY"), reason="No API key")
 def test_real_claude_decision():
     context = DecisionContext(
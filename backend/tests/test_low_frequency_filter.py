@@ -14,6 +14,7 @@ Use min_frequency=65Hz explicitly if bass notes are needed.
 
 import sys
 import os
+from functools import lru_cache
 import numpy as np
 
 # Add parent to path
@@ -23,33 +24,57 @@ from optimized_yin import detect_piano_note
 
 SAMPLE_RATE = 44100
 
-def generate_sine(freq: float, duration_ms: float = 500, amplitude: float = 0.5) -> list:
-    """Generate pure sine wave at given frequency."""
-    num_samples = int((duration_ms / 1000.0) * SAMPLE_RATE)
-    t = np.arange(num_samples) / SAMPLE_RATE
-    audio = amplitude * np.sin(2 * np.pi * freq * t)
-    return audio.astype(np.float32).tolist()
+# Seeded generator so the noise cases are reproducible run to run
+_RNG = np.random.default_rng(0)
 
-def generate_piano_tone(freq: float, duration_ms: float = 500, amplitude: float = 0.5) -> list:
-    """Generate piano-like tone with harmonics."""
+@lru_cache(maxsize=8)
+def _time_axis(duration_ms: float) -> np.ndarray:
+    """Sample times for a clip of this length, shared read-only between generators."""
     num_samples = int((duration_ms / 1000.0) * SAMPLE_RATE)
     t = np.arange(num_samples) / SAMPLE_RATE
+    t.setflags(write=False)
+    return t
+
+@lru_cache(maxsize=8)
+def _envelope(duration_ms: float) -> np.ndarray:
+    """Exponential decay envelope for a tone of this length (shared, read-only)."""
+    envelope = np.exp(-3 * _time_axis(duration_ms) / (duration_ms / 1000.0))
+    envelope.setflags(write=False)
+    return envelope
+
+def generate_sine(freq: float, duration_ms: float = 500, amplitude: float = 0.5) -> np.ndarray:
+    """Generate pure sine wave at given frequency."""
+    t = _time_axis(duration_ms)
+    audio = amplitude * np.sin(2 * np.pi * freq * t)
+    return audio.astype(np.float32)
 
-    # Fundamental + harmonics with decay
-    audio = np.zeros(num_samples, dtype=np.float32)
-    harmonics = [1.0, 0.5, 0.25, 0.125, 0.0625]  # Decreasing amplitude
+@lru_cache(maxsize=64)
+def generate_piano_tone(freq: float, duration_ms: float = 500, amplitude: float = 0.5) -> np.ndarray:
+    """Generate piano-like tone with harmonics (memoized, read-only)."""
+    t = _time_axis(duration_ms)
 
-    for i, h_amp in enumerate(harmonics):
-        h_freq = freq * (i + 1)
-        if h_freq < SAMPLE_RATE / 2:  # Below Nyquist
-            audio += h_amp * np.sin(2 * np.pi * h_freq * t)
+    # Fundamental + harmonics below Nyquist, summed as one weighted product
+    harmonics = np.array([1.0, 0.5, 0.25, 0.125, 0.0625])  # Decreasing amplitude
+    h_freqs = freq * np.arange(1, len(harmonics) + 1)
+    below_nyquist = h_freqs < SAMPLE_RATE / 2
+    audio = harmonics[below_nyquist] @ np.sin(2 * np.pi * np.outer(h_freqs[below_nyquist], t))
 
     # Normalize and apply envelope
     audio = audio / np.max(np.abs(audio)) * amplitude
-    envelope = np.exp(-3 * t / (duration_ms / 1000.0))
-    audio = audio * envelope
+    audio = audio * _envelope(duration_ms)
 
-    return audio.astype(np.float32).tolist()
+    audio = audio.astype(np.float32)
+    audio.setflags(write=False)
+    return audio
+
+@lru_cache(maxsize=64)
+def _detect_tone(freq: float, duration_ms: float, amplitude: float):
+    """detect_piano_note on a synthetic tone, cached per (freq, duration, amplitude)."""
+    return detect_piano_note(generate_piano_tone(freq, duration_ms, amplitude), SAMPLE_RATE)
+
+def detect_tone(freq: float, duration_ms: float = 500, amplitude: float = 0.5):
+    """Detect a generated piano tone; parameters are rounded so equal tones share a cache entry."""
+    return _detect_tone(round(freq, 2), duration_ms, round(amplitude, 3))
 
 # Test frequencies
 FREQUENCIES = {
@@ -80,8 +105,7 @@ def test_filter_below_c2():
 
     for note_name in below_c2:
         freq = FREQUENCIES[note_name]
-        audio = generate_piano_tone(freq, 500, 0.5)
-        result = detect_piano_note(audio, SAMPLE_RATE)
+        result = detect_tone(freq, 500, 0.5)
 
         if result is None:
             print(f"✓ {note_name} ({freq:.1f}Hz): Correctly filtered (no detection)")
@@ -110,12 +134,10 @@ def test_low_notes_high_confidence():
         freq = FREQUENCIES[note_name]
 
         # Test with weak signal (should be filtered)
-        weak_audio = generate_piano_tone(freq, 500, 0.1)  # Low amplitude
-        weak_result = detect_piano_note(weak_audio, SAMPLE_RATE)
+        weak_result = detect_tone(freq, 500, 0.1)  # Low amplitude
 
         # Test with strong signal (should pass)
-        strong_audio = generate_piano_tone(freq, 500, 0.5)  # Normal amplitude
-        strong_result = detect_piano_note(strong_audio, SAMPLE_RATE)
+        strong_result = detect_tone(freq, 500, 0.5)  # Normal amplitude
 
         print(f"\n{note_name} ({freq:.1f}Hz):")
         if weak_result is None:
@@ -139,8 +161,7 @@ def test_normal_range():
 
     for note_name in normal_notes:
         freq = FREQUENCIES[note_name]
-        audio = generate_piano_tone(freq, 500, 0.3)
-        result = detect_piano_note(audio, SAMPLE_RATE)
+        result = detect_tone(freq, 500, 0.3)
 
         if result:
             detected_note = result['note']
@@ -177,8 +198,7 @@ def test_octave_accuracy():
 
     passed = 0
     for note_name, freq in test_notes:
-        audio = generate_piano_tone(freq, 500, 0.4)
-        result = detect_piano_note(audio, SAMPLE_RATE)
+        result = detect_tone(freq, 500, 0.4)
 
         if result:
             detected_note = result['note']
@@ -207,9 +227,17 @@ def test_false_positive_resistance():
     # Generate various noise types
     num_samples = int(0.5 * SAMPLE_RATE)
 
+    # Draw straight into float32 buffers; scale in place
+    white = np.empty(num_samples, dtype=np.float32)
+    _RNG.standard_normal(dtype=np.float32, out=white)
+    white *= 0.1
+    pink = np.empty(num_samples, dtype=np.float32)
+    np.cumsum(_RNG.standard_normal(num_samples, dtype=np.float32), out=pink)
+    pink *= 0.001
+
     noises = {
-        'White noise': np.random.randn(num_samples).astype(np.float32) * 0.1,
-        'Pink noise (low freq bias)': np.cumsum(np.random.randn(num_samples)).astype(np.float32) * 0.001,
+        'White noise': white,
+        'Pink noise (low freq bias)': pink,
         'Silence': np.zeros(num_samples, dtype=np.float32),
         'Very quiet sine': 0.002 * np.sin(2 * np.pi * 100 * np.arange(num_samples) / SAMPLE_RATE).astype(np.float32),
     }
@@ -217,7 +245,7 @@ def test_false_positive_resistance():
     low_octave_detections = 0
 
     for noise_type, audio in noises.items():
-        result = detect_piano_note(audio.tolist(), SAMPLE_RATE)
+        result = detect_piano_note(audio, SAMPLE_RATE)
 
         if result is None:
             print(f"✓ {noise_type}: No detection (correct)")